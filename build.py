@@ -0,0 +1,22 @@
+"""Optional Cython build of the request hot path
+
+Compiles modules in place, run with `python build.py`.
+Packages built by poetry are plain Python either way"""
+
+MODULES = ["saaba/saaba.py", "saaba/containers.py", "saaba/__pathargs.py"]
+
+
+def build() -> None:
+    """Compile modules next to their sources"""
+    # pylint: disable=import-outside-toplevel
+    from Cython.Build import cythonize
+    from setuptools import setup
+
+    setup(
+        script_args=["build_ext", "--inplace"],
+        ext_modules=cythonize(MODULES, language_level=3),
+    )
+
+
+if __name__ == "__main__":
+    build()
@@ -13,4 +13,5 @@ def _(req, res):
 
 app.static("/", PATH + "/")
 
-app.listen("0.0.0.0", 3000, lambda: print("http://127.0.0.1:3000"))
+if __name__ == "__main__":
+    app.listen("0.0.0.0", 3000, lambda: print("http://127.0.0.1:3000"))
@@ -1,19 +1,87 @@
-import re
+"""Path parameters"""
+
+from __future__ import annotations
+
+__all__ = ["TrieNode"]
+
+from dataclasses import dataclass, field
 from typing import Any
 
-format = "users/{user}/messages/{message}"
-query = "users/virashu/messages/mondays"
+from .typing import RouteCallable
+
+
+@dataclass(slots=True)
+class TrieNode:
+    """Route trie node
+
+    Path segments are either plain, `{name}` params or `*` wildcard"""
+
+    children: dict[str, TrieNode] = field(default_factory=dict)
+    param_child: tuple[str, TrieNode] | None = None
+    wildcard_child: TrieNode | None = None
+    handler: RouteCallable | None = None
+
+    def insert(self, path: str, handler: RouteCallable) -> None:
+        """Add route"""
+        node = self
+
+        for segment in path.split("/"):
+            if not segment:
+                continue
+
+            if segment == "*":
+                # Wildcard consumes the rest of the path
+                if node.wildcard_child is None:
+                    node.wildcard_child = TrieNode()
+                node = node.wildcard_child
+                break
+
+            if segment.startswith("{") and segment.endswith("}"):
+                name = segment[1:-1]
+                if node.param_child is None:
+                    node.param_child = (name, TrieNode())
+                elif node.param_child[0] != name:
+                    raise ValueError(
+                        f"Path param {{{name}}} in {path} conflicts with "
+                        f"{{{node.param_child[0]}}}"
+                    )
+                node = node.param_child[1]
+            else:
+                node = node.children.setdefault(segment, TrieNode())
 
+        node.handler = handler
 
-def find_vars(_format: str, _query: str) -> dict[str, Any] | None:
-    re_format = re.sub(r"{(\w+)}", r"(?P<\1>\\w+)", _format)
+    def match(self, path: str) -> tuple[RouteCallable | None, dict[str, Any]]:
+        """Find route handler and path params"""
+        params: dict[str, Any] = {}
+        segments = [segment for segment in path.split("/") if segment]
+        return self._match(segments, 0, params), params
 
-    pattern = re.compile(re_format)
+    def _match(
+        self, segments: list[str], i: int, params: dict[str, Any]
+    ) -> RouteCallable | None:
+        # pylint: disable=protected-access
+        # Plain segments take precedence over params, params over wildcard
+        if i == len(segments):
+            if self.handler is not None:
+                return self.handler
+        else:
+            segment = segments[i]
 
-    if match := pattern.match(_query):
-        return match.groupdict()
+            child = self.children.get(segment)
+            if child is not None:
+                if (handler := child._match(segments, i + 1, params)) is not None:
+                    return handler
 
-    return None
+            if self.param_child is not None:
+                name, child = self.param_child
+                if (handler := child._match(segments, i + 1, params)) is not None:
+                    params[name] = segment
+                    return handler
 
+        wildcard = self.wildcard_child
+        if wildcard is not None and wildcard.handler is not None:
+            params["*"] = "/".join(segments[i:])
+            return wildcard.handler
 
-print(find_vars(format, query))
+        return None
@@ -0,0 +1,6 @@
+cdef class Response:
+    cdef public bytearray data
+    cdef public int status
+    cdef object _json
+    cdef str _content_type
+    cdef dict _headers
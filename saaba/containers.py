@@ -2,12 +2,18 @@ from __future__ import annotations
 
 __all__ = ["Request", "Response"]
 
-import json
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, ClassVar, Iterable
 
+from .utils import json_dumps, json_loads
 
-@dataclass
+_CORS_HEADER = ("Access-Control-Allow-Origin", "*")
+
+# Headers of a response that never touched them, shared between responses
+_DEFAULT_HEADER_ITEMS = (("Content-type", "text/html"), _CORS_HEADER)
+
+
+@dataclass(slots=True)
 class Request:
     """Request class
 
@@ -18,47 +24,108 @@ class Request:
     query: dict[str, Any] | None
     body: dict[str, Any] | None
     client: tuple[str, int]
+    params: dict[str, Any] | None = None
 
 
 class Response:
     """Response class
 
-    Used to modify response data"""
+    Used to modify response data.
+    `data` holds only non-JSON bytes, use `to_bytes()` for encoded body"""
+
+    __slots__ = ("data", "status", "_json", "_content_type", "_headers")
+
+    # Template for the headers dict, never mutated
+    _DEFAULT_HEADERS: ClassVar[dict[str, str]] = dict(_DEFAULT_HEADER_ITEMS)
 
     def __init__(self) -> None:
-        self.headers: dict[str, Any] = {
-            "Content-type": "text/html",
-            "Access-Control-Allow-Origin": "*",
-        }
-        self.data: Any = ""
+        self.data = bytearray()
         self.status = 200
+        # JSON data is kept as dict until written, so merges are cheap
+        self._json: dict[Any, Any] | None = None
+        # Headers dict is only built if it is accessed, until then
+        # `Content-type` is the only header that differs from defaults
+        self._content_type = "text/html"
+        self._headers: dict[str, Any] | None = None
 
-    def send(self, data: dict[Any, Any] | str) -> Response:
-        """Send data"""
-        if isinstance(data, dict):
-            content_type = "application/json"
-            data = json.dumps(data)
+    @property
+    def headers(self) -> dict[str, Any]:
+        """Response headers"""
+        if self._headers is None:
+            self._headers = Response._DEFAULT_HEADERS.copy()
+            self._headers["Content-type"] = self._content_type
+        return self._headers
+
+    @headers.setter
+    def headers(self, value: dict[str, Any]) -> None:
+        self._headers = value
+
+    def _set_content_type(self, value: str) -> None:
+        if self._headers is None:
+            self._content_type = value
         else:
-            content_type = "text/html"
-        self.headers["Content-type"] = content_type
-        self.data = data
+            self._headers["Content-type"] = value
+
+    def send(self, data: dict[Any, Any] | str | bytes) -> Response:
+        """Send data
+
+        Bytes are sent as is, without re-encoding"""
+        if isinstance(data, dict):
+            self._set_content_type("application/json")
+            # Copied, as it's encoded only after the handler returns
+            self._json = dict(data)
+            self.data = bytearray()
+            return self
+
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._set_content_type("text/html")
+        self._json = None
+        self.data = bytearray(data)
         return self
 
-    def add(self, data: dict[Any, Any] | str) -> Response:
+    def add(self, data: dict[Any, Any] | str | bytes) -> Response:
         """Add data"""
-        content_type = self.headers["Content-type"]
         if isinstance(data, dict):
-            if self.data:
-                if content_type == "application/json":
-                    data_merge = json.loads(self.data)
-                    data |= data_merge
-                else:
-                    return self
-
-            data = json.dumps(data)
+            content_type: str | None
+            if self._headers is None:
+                content_type = self._content_type
+            else:
+                content_type = self._headers.get("Content-type")
+
+            if self._json is not None:
+                self._json = data | self._json
+            elif not self.data:
+                self._json = dict(data)
+            elif content_type == "application/json":
+                self._json = data | json_loads(self.data)
+                self.data.clear()
+            return self
+
+        if self._json is not None:
+            self.data += json_dumps(self._json)
+            self._json = None
+
+        if isinstance(data, str):
+            data = data.encode("utf-8")
         self.data += data
         return self
 
+    def header_items(self) -> Iterable[tuple[str, Any]]:
+        """Get header name/value pairs"""
+        if self._headers is None:
+            # Common case, no dict needed
+            if self._content_type == "text/html":
+                return _DEFAULT_HEADER_ITEMS
+            return (("Content-type", self._content_type), _CORS_HEADER)
+        return self._headers.items()
+
+    def to_bytes(self) -> bytes | bytearray:
+        """Get encoded response data"""
+        if self._json is not None:
+            return json_dumps(self._json)
+        return self.data
+
     def set_status(self, value: int) -> Response:
         """Set response code"""
         self.status = value
@@ -4,195 +4,682 @@ from __future__ import annotations
 
 __all__ = ["App"]
 
-import json
+import asyncio
 import logging
+import os
+import socket
+import threading
+import time
 import typing as t
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from mimetypes import guess_type
-from os.path import exists
-from typing import Any, Callable
-
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache, partial
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from os.path import splitext
+from stat import S_ISDIR
+from typing import Any, Callable, Iterable
+from urllib.parse import parse_qsl
+
+from .__pathargs import TrieNode
 from .containers import Request, Response
-from .typing import RouteCallable, RouteDecorator
-from .utils import read_file
+from .typing import Receive, RouteCallable, RouteDecorator, Scope, Send
+from .utils import json_loads
+
+if t.TYPE_CHECKING:
+    import uvicorn
 
 logger = logging.getLogger(__name__)
 
 http_server_logger = logging.getLogger("http.server")
 
+# Key for the mount stored in a static trie node, can't collide with segments
+_MOUNT = ("__mount__",)
+
+_HTML_HEADERS = (("Content-type", "text/html"),)
+
+_NOT_FOUND_BODY = b"<h1>File not found</h1>"
+
+# Size of chunks static files are streamed in, if not sent with `sendfile`
+_CHUNK_SIZE = 64 * 1024
+
+# Common web types, anything else goes through `mimetypes`
+_MIME_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".htm": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+    ".mjs": "text/javascript; charset=utf-8",
+    ".json": "application/json",
+    ".txt": "text/plain; charset=utf-8",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".ico": "image/vnd.microsoft.icon",
+    ".woff": "font/woff",
+    ".woff2": "font/woff2",
+    ".mp4": "video/mp4",
+    ".wasm": "application/wasm",
+}
+
+
+@lru_cache(maxsize=256)
+def _guess_type(ext: str) -> str | None:
+    """Guess MIME type by file extension"""
+    # Only needed for types missing from the table
+    from mimetypes import guess_type  # pylint: disable=import-outside-toplevel
+
+    return guess_type("x" + ext)[0]
+
+
+@lru_cache(maxsize=64)
+def _response_head(protocol: str, status: int, server_version: str) -> bytes:
+    """Encoded status line and `Server` header"""
+    responses = BaseHTTPRequestHandler.responses
+    reason = responses[status][0] if status in responses else ""
+    head = f"{protocol} {status} {reason}\r\nServer: {server_version}\r\n"
+    return head.encode("latin-1")
+
+
+@lru_cache(maxsize=2)
+def _date_header(timestamp: int) -> bytes:
+    """Encoded `Date` header, changes once a second"""
+    return f"Date: {formatdate(timestamp, usegmt=True)}\r\n".encode("latin-1")
+
+
+def _write_response(
+    server: BaseHTTPRequestHandler,
+    status: int,
+    headers: Iterable[tuple[str, Any]],
+    body: bytes | bytearray | None = None,
+) -> None:
+    """Write status line, headers and body (if given) with a single write
+
+    Replaces `send_response` / `send_header` / `end_headers` sequence"""
+    server.log_request(status)
+
+    buf = bytearray(
+        _response_head(server.protocol_version, status, server.version_string())
+    )
+    buf += _date_header(int(time.time()))
+
+    lines = []
+    for key, value in headers:
+        name = key.lower()
+        if name == "connection":
+            # Same as `send_header`, the header is written once below
+            token = str(value).lower()
+            if token == "close":
+                server.close_connection = True
+            elif token == "keep-alive":
+                server.close_connection = False
+            continue
+        if name == "content-length" and body is not None:
+            # Computed from the body
+            continue
+        lines.append(f"{key}: {value}\r\n")
+
+    if server.close_connection:
+        buf += b"Connection: close\r\n"
+    else:
+        buf += b"Connection: keep-alive\r\n"
+    if body is not None:
+        lines.append(f"Content-Length: {len(body)}\r\n")
+    buf += "".join(lines).encode("latin-1")
+    buf += b"\r\n"
+
+    if body:
+        buf += body
+
+    server.wfile.write(buf)
+
+
+def _read_body(server: BaseHTTPRequestHandler) -> bytes | None:
+    """Read request body of `Content-Length` bytes
+
+    `None` if the length isn't a non-negative integer, the body can't be
+    skipped then, so the connection must be closed"""
+    value = server.headers.get("Content-Length")
+    if value is None:
+        return b""
+
+    value = value.strip()
+    if not (value.isascii() and value.isdigit()):
+        return None
+
+    length = int(value)
+    return server.rfile.read(length) if length else b""
+
+
+def _bad_request(server: BaseHTTPRequestHandler) -> None:
+    """Respond 400 and close the connection"""
+    server.close_connection = True
+    _write_response(server, 400, _HTML_HEADERS, b"<h1>Bad request</h1>")
+
+
+def _stat_file(abspath: str) -> tuple[str, os.stat_result, str] | None:
+    """Get file path (`index.html` for directories), stat and MIME type"""
+    try:
+        st = os.stat(abspath)
+        if S_ISDIR(st.st_mode):
+            abspath = os.path.join(abspath, "index.html")
+            st = os.stat(abspath)
+    except (OSError, ValueError):
+        # `ValueError` is raised for paths with NUL bytes
+        return None
+
+    ext = splitext(abspath)[1].lower()
+    content_type = (
+        _MIME_TYPES.get(ext) or _guess_type(ext) or "application/octet-stream"
+    )
+
+    return abspath, st, content_type
+
+
+def _asgi_headers(headers: Iterable[tuple[str, Any]]) -> list[tuple[bytes, bytes]]:
+    """Encode headers for ASGI"""
+    return [
+        (key.lower().encode("latin-1"), str(value).encode("latin-1"))
+        for key, value in headers
+    ]
+
+
+async def _asgi_body(receive: Receive) -> bytearray:
+    """Receive whole ASGI request body"""
+    body = bytearray()
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+def _asgi_header(scope: Scope, name: bytes) -> str | None:
+    """Get ASGI request header by lowercase name"""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _asgi_respond(
+    send: Send,
+    status: int,
+    headers: Iterable[tuple[str, Any]],
+    body: bytes | bytearray | None = None,
+) -> None:
+    """Send ASGI response"""
+    raw_headers = _asgi_headers(headers)
+    if body is not None:
+        # Computed from the body, even if set by the handler
+        raw_headers = [item for item in raw_headers if item[0] != b"content-length"]
+        raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
 
-class App:
-    "App"
+    await send(
+        {"type": "http.response.start", "status": status, "headers": raw_headers}
+    )
+    await send({"type": "http.response.body", "body": bytes(body or b"")})
 
-    def __init__(self) -> None:
-        class _Server(BaseHTTPRequestHandler):
-            saaba_parent_app: "App | None" = None
-
-            # pylint: disable=invalid-name,missing-function-docstring
-            def do_GET(self) -> None:
-                if self.saaba_parent_app is None:
-                    return
-                self.saaba_parent_app.handle_get(self)
-
-            # pylint: disable=invalid-name,missing-function-docstring
-            def do_POST(self) -> None:
-                if self.saaba_parent_app is None:
-                    return
-                self.saaba_parent_app.handle_post(self)
-
-            # Original method just throws it into stderr instead of using logging module
-            # :(
-            # pylint: disable=redefined-builtin
-            def log_message(self, format: str, *args: t.Any) -> None:
-                http_server_logger.info(format, *args)
-
-        self.routes: dict[str, dict[str, Callable[..., Any]]] = {
-            "get": {},
-            "post": {},
-        }
-        self._static_dict: dict[str, str] = {}
-        self._server = _Server
-        self._server.saaba_parent_app = self
-        self._server_instance: HTTPServer
 
-    def handle_get(self, server: BaseHTTPRequestHandler):
-        """GET request handler
+async def _asgi_send_file(send: Send, f: t.BinaryIO, headers: dict[str, str]) -> None:
+    """Send file as ASGI response in chunks, without reading it at once
 
-        Called from child"""
-        path: str = server.path
-        client: tuple[str, int] = server.client_address
-        query: dict[str, Any] = {}
+    Headers must have `Content-Length` of the file"""
+    loop = asyncio.get_running_loop()
+    raw_headers = _asgi_headers(headers.items())
+    size = int(headers["Content-Length"])
 
-        if "?" in path:
-            url, query_string = path.split("?")
+    await send({"type": "http.response.start", "status": 200, "headers": raw_headers})
 
-            for x in query_string.split("&"):
-                key, value = x.split("=")
-                query[key] = value
-        else:
-            url = path
+    remaining = size
+    more_body = True
+    while more_body:
+        chunk = await loop.run_in_executor(None, f.read, min(_CHUNK_SIZE, remaining))
+        remaining -= len(chunk)
+        # Stops early if the file was truncated since stat
+        more_body = bool(chunk) and remaining > 0
+        await send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
 
-        if url.rstrip("/") in self.routes["get"]:
-            # Found in direct routes
 
-            request = Request(
-                path=path,
-                client=client,
-                url=url,
-                query=query,
-                body=None,
-            )
-            response = Response()
+def _send_file(server: BaseHTTPRequestHandler, f: t.BinaryIO, size: int) -> None:
+    """Copy file to client, in kernel space where `sendfile` is available"""
+    server.wfile.flush()
+    # Falls back to plain `send` calls if the platform has no `os.sendfile`
+    server.connection.sendfile(f, 0, size)
 
-            # Call user function
-            self.routes["get"][url.rstrip("/")](request, response)
-            logger.info("GET %s", url.rstrip("/"))
 
-            server.send_response(response.status)
+def _default_workers() -> int:
+    """Route handler limit, same as `ThreadPoolExecutor` default"""
+    return min(32, (os.cpu_count() or 1) + 4)
 
-            for key, value in response.headers.items():
-                server.send_header(key, value)
 
-            server.end_headers()
+def _not_modified(since: str | None, mtime: float) -> bool:
+    """Check if client's cached copy (`If-Modified-Since`) is still fresh"""
+    if since is None:
+        return False
 
-            server.wfile.write(bytes(response.data, "utf-8"))
+    try:
+        since_date = parsedate_to_datetime(since)
+    except (TypeError, ValueError):
+        return False
 
-        elif self.is_static(url):
-            # Found in static routes
-            abspath = self.find_static(self._static_dict, server.path)
-            abspath.replace("../", "")
+    if since_date.tzinfo is None:
+        since_date = since_date.replace(tzinfo=timezone.utc)
 
-            if abspath.endswith("/"):
-                abspath += "index.html"
+    return int(mtime) <= since_date.timestamp()
 
-            if not exists(abspath):
-                server.send_response(404)
-                server.end_headers()
-                return
 
-            content = read_file(abspath)
+class _FileCache:
+    """LRU cache of small static files, invalidated by modification time"""
 
-            server.send_response(200)
+    max_file_size = 1024 * 1024
 
-            content_type, _ = guess_type(abspath)
-            if not content_type:
-                raise ValueError(f"Unknown MIME type for {abspath}")
-            server.send_header("Content-type", content_type)
-            server.send_header("Access-Control-Allow-Origin", "*")
-            server.end_headers()
+    def __init__(
+        self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[int, bytes]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
 
-            server.wfile.write(bytes(content, "utf-8"))
+    def read(self, path: str, st: os.stat_result) -> bytes | None:
+        """Get file contents, from cache if file is unchanged since cached
 
-        else:
-            # Not found in direct/static routes
-            server.send_response(404)
-            server.send_header("Content-type", "text/html")
-            server.end_headers()
-            server.wfile.write(bytes("<h1>File not found</h1>", "utf-8"))
+        `None` if the file can't be read, e.g. it was removed after stat"""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == st.st_mtime_ns:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        if len(content) > self.max_file_size:
+            return content
+
+        with self._lock:
+            if (old := self._entries.pop(path, None)) is not None:
+                self._size -= len(old[1])
+            self._entries[path] = (st.st_mtime_ns, content)
+            self._size += len(content)
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+        return content
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    """HTTP server handling each connection in its own thread
+
+    Route handlers may run concurrently, so they must be thread-safe"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_class: type[BaseHTTPRequestHandler],
+    ) -> None:
+        super().__init__(server_address, handler_class)
+        self._connections: set[socket.socket] = set()
+
+    def process_request(self, request: t.Any, client_address: t.Any) -> None:
+        self._connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request: t.Any) -> None:
+        self._connections.discard(request)
+        super().shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Wake up threads waiting on idle keep-alive connections, so they
+        # don't keep serving after the server is closed
+        for connection in list(self._connections):
+            try:
+                connection.shutdown(socket.SHUT_RD)
+            except OSError:
+                pass
+
+
+class _SaabaServer(BaseHTTPRequestHandler):
+    saaba_parent_app: t.ClassVar[App | None] = None
+
+    # Keep connections alive, idle ones are dropped after `timeout` seconds
+    protocol_version = "HTTP/1.1"
+    timeout = 15
+    # Responses are written at once, so send them without waiting for ACKs
+    disable_nagle_algorithm = True
+
+    # pylint: disable=missing-function-docstring,protected-access
+    def dispatch(self) -> None:
+        if self.saaba_parent_app is None:
+            return
+        self.saaba_parent_app._dispatch[self.command](self)
+
+    # Every supported method goes through the same dispatcher
+    do_GET = do_POST = dispatch
+
+    # Original method just throws it into stderr instead of using logging module
+    # :(
+    # pylint: disable=redefined-builtin
+    def log_message(self, format: str, *args: t.Any) -> None:
+        http_server_logger.info(format, *args)
+
+
+class App:
+    "App"
+
+    def __init__(self) -> None:
+        self._router: dict[str, TrieNode] = {
+            "get": TrieNode(),
+            "post": TrieNode(),
+        }
+        # Routes without params, looked up before walking the trie
+        self._routes: dict[str, dict[str, RouteCallable]] = {"get": {}, "post": {}}
+        self._dispatch: dict[str, Callable[[BaseHTTPRequestHandler], None]] = {
+            "GET": self.handle_get,
+            "POST": self.handle_post,
+        }
+        self._static_trie: dict[Any, Any] = {}
+        self._static_prefixes: tuple[str, ...] = ()
+        self._file_cache = _FileCache()
+        # Subclass per app, so several apps can be served in one process
+        self._server: type[_SaabaServer] = type(
+            "_Server", (_SaabaServer,), {"saaba_parent_app": self}
+        )
+        self._server_instance: HTTPServer
+        self._uvicorn_server: uvicorn.Server | None = None
+        # Executor for route handlers under ASGI, `None` for loop's default
+        self._executor: ThreadPoolExecutor | None = None
+        # Bounds concurrent route handlers under `http.server`
+        self._route_slots = threading.BoundedSemaphore(_default_workers())
+
+    def handle_get(self, server: BaseHTTPRequestHandler) -> None:
+        """GET request handler
+
+        Called from child"""
+        self._handle(server, "get")
 
     def handle_post(self, server: BaseHTTPRequestHandler) -> None:
         """POST request handler"""
-        if server.path.rstrip("/") in self.routes["post"]:
-            # Found in direct routes
-            path = server.path
-            url = path
-            client = server.client_address
+        self._handle(server, "post")
 
-            body_raw: str = ""
+    def _handle(self, server: BaseHTTPRequestHandler, method: str) -> None:
+        """Serve request with `http.server`"""
+        # Body is read even if unused, so the connection can be reused
+        body_raw = _read_body(server)
+        if body_raw is None:
+            _bad_request(server)
+            return
 
-            while not body_raw.count("{") or body_raw.count("{") != body_raw.count("}"):
-                body_raw += server.rfile.read(1).decode()
+        url, _, query_string = server.path.partition("?")
+        handler, params = self._match(method, url)
 
-            body = json.loads(body_raw)
+        if handler is not None:
+            # Found in direct routes
+            with self._route_slots:
+                response = self._call_route(
+                    handler=handler,
+                    params=params,
+                    method=method,
+                    url=url,
+                    query_string=query_string,
+                    client=server.client_address,
+                    body_raw=body_raw,
+                )
+            _write_response(
+                server, response.status, response.header_items(), response.to_bytes()
+            )
+            return
 
-            request = Request(
-                path=path,
-                client=client,
-                url=url,
-                query=None,
-                body=body,
+        if method == "get":
+            status, headers, content = self._static_response(
+                url, server.headers.get("If-Modified-Since")
             )
-            response = Response()
+            if content is None or isinstance(content, bytes):
+                _write_response(server, status, headers.items(), content)
+                return
+
+            # Large file, already opened
+            with content:
+                _write_response(server, status, headers.items())
+                _send_file(server, content, int(headers["Content-Length"]))
+            return
 
-            # Call user function
-            self.routes["post"][server.path.rstrip("/")](request, response)
+        # Not found in direct routes
+        _write_response(server, 404, _HTML_HEADERS, _NOT_FOUND_BODY)
 
-            server.send_response(response.status)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """ASGI application
 
-            for key, value in response.headers.items():
-                server.send_header(key, value)
+        Serves the same routes, e.g. `uvicorn.run(app)`.
+        Route handlers run in the default executor"""
+        if scope["type"] == "lifespan":
+            while (await receive())["type"] != "lifespan.shutdown":
+                await send({"type": "lifespan.startup.complete"})
+            await send({"type": "lifespan.shutdown.complete"})
+            return
 
-            server.end_headers()
+        if scope["type"] != "http":
+            return
 
-            server.wfile.write(bytes(response.data, "utf-8"))
+        loop = asyncio.get_running_loop()
+        method: str = scope["method"].lower()
+        url: str = scope["path"]
 
+        handler, params = (
+            self._match(method, url) if method in self._router else (None, {})
+        )
+
+        if handler is not None:
+            # Found in direct routes
+            body_raw = await _asgi_body(receive)
+            response = await loop.run_in_executor(
+                self._executor,
+                partial(
+                    self._call_route,
+                    handler=handler,
+                    params=params,
+                    method=method,
+                    url=url,
+                    query_string=scope["query_string"].decode("latin-1"),
+                    client=tuple(scope["client"]) if scope.get("client") else ("", 0),
+                    body_raw=body_raw,
+                ),
+            )
+            await _asgi_respond(
+                send, response.status, response.header_items(), response.to_bytes()
+            )
+            return
+
+        if method == "get":
+            status, headers, content = await loop.run_in_executor(
+                None,
+                self._static_response,
+                url,
+                _asgi_header(scope, b"if-modified-since"),
+            )
+            if content is None or isinstance(content, bytes):
+                await _asgi_respond(send, status, headers.items(), content)
+                return
+
+            # Large file, already opened
+            with content:
+                await _asgi_send_file(send, content, headers)
+            return
+
+        # Not found in direct routes
+        await _asgi_respond(send, 404, _HTML_HEADERS, _NOT_FOUND_BODY)
+
+    def _call_route(
+        self,
+        *,
+        handler: RouteCallable,
+        params: dict[str, Any],
+        method: str,
+        url: str,
+        query_string: str,
+        client: tuple[str, int],
+        body_raw: bytes | bytearray,
+    ) -> Response:
+        """Build request, call route handler and get its response
+
+        Same for every transport. Query is parsed for GET, body for POST"""
+        # pylint: disable=too-many-arguments
+        request = Request(
+            path=f"{url}?{query_string}" if query_string else url,
+            client=client,
+            url=url,
+            query=(
+                dict(parse_qsl(query_string, keep_blank_values=True))
+                if method == "get"
+                else None
+            ),
+            body=json_loads(body_raw) if method == "post" and body_raw else None,
+            params=params,
+        )
+        response = Response()
+
+        # Call user function
+        handler(request, response)
+        logger.info("%s %s", method.upper(), url)
+
+        return response
+
+    def _static_response(
+        self, url: str, since: str | None
+    ) -> tuple[int, dict[str, str], bytes | t.BinaryIO | None]:
+        """Get status, headers and contents of static file
+
+        Small files are read through the cache, larger ones are returned
+        opened, to be streamed by the transport. 404 if nothing matched"""
+        abspath = self._resolve_static(url)
+        found = _stat_file(abspath) if abspath is not None else None
+        if found is None:
+            return 404, dict(_HTML_HEADERS), _NOT_FOUND_BODY
+        abspath, st, content_type = found
+
+        if _not_modified(since, st.st_mtime):
+            return 304, {}, None
+
+        headers = {
+            "Content-type": content_type,
+            "Access-Control-Allow-Origin": "*",
+            "Last-Modified": formatdate(int(st.st_mtime), usegmt=True),
+        }
+
+        if st.st_size <= _FileCache.max_file_size:
+            # Small files are served from memory
+            content = self._file_cache.read(abspath, st)
+            if content is not None:
+                return 200, headers, content
         else:
-            # Not found in direct routes
-            server.send_response(404)
-            server.send_header("Content-type", "text/html")
-            server.end_headers()
-            server.wfile.write(bytes("<h1>File not found</h1>", "utf-8"))
+            try:
+                f = open(abspath, "rb")  # pylint: disable=consider-using-with
+            except OSError:
+                pass
+            else:
+                headers["Content-Length"] = str(st.st_size)
+                return 200, headers, f
+
+        # Removed since stat
+        return 404, dict(_HTML_HEADERS), _NOT_FOUND_BODY
 
     def listen(
-        self, ip: str, port: int, callback: Callable[..., None] | None = None
+        self,
+        ip: str,
+        port: int,
+        callback: Callable[..., None] | None = None,
+        max_workers: int | None = None,
     ) -> None:
-        """Start the app"""
-        self._server_instance = HTTPServer((ip, port), self._server)
+        """Start the app
+
+        Served with uvicorn if it is installed, else with `http.server`.
+        Up to `max_workers` route handlers run concurrently,
+        so they must be thread-safe"""
+        try:
+            import uvicorn  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            pass
+        else:
+            if max_workers is not None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="saaba"
+                )
+
+            class _UvicornServer(uvicorn.Server):
+                async def startup(self, sockets: Any = None) -> None:
+                    # uvicorn exits on bind errors, raise like `http.server`
+                    try:
+                        await super().startup(sockets)
+                    except SystemExit as e:
+                        raise OSError(f"Could not listen on {ip}:{port}") from e
+
+                    # Socket is bound now, same as with `http.server`
+                    if self.started and callback is not None:
+                        callback()
+
+            self._uvicorn_server = _UvicornServer(
+                uvicorn.Config(self, host=ip, port=port, log_config=None)
+            )
+            self._uvicorn_server.run()
+            return
+
+        if max_workers is not None:
+            self._route_slots = threading.BoundedSemaphore(max_workers)
+        self._server_instance = _HTTPServer((ip, port), self._server)
         if callback is not None:
             callback()
 
-        self._server_instance.serve_forever()
+        try:
+            self._server_instance.serve_forever()
+        finally:
+            self._server_instance.server_close()
 
     def stop(self) -> None:
         """Stop the app"""
+        if self._uvicorn_server is not None:
+            self._uvicorn_server.should_exit = True
+            return
+
         self._server_instance.shutdown()
 
+    def _match(
+        self, method: str, url: str
+    ) -> tuple[RouteCallable | None, dict[str, Any]]:
+        """Find route handler and path params"""
+        if (handler := self._routes[method].get(url)) is not None:
+            return handler, {}
+        return self._router[method].match(url)
+
     def route(self, methods: list[str], path: str) -> RouteDecorator:
         """Set route"""
 
         def decorator(func: RouteCallable) -> RouteCallable:
             for method in methods:
-                self.routes[method.lower()][path.rstrip("/")] = func
+                method = method.lower()
+                self._router[method].insert(path, func)
+                if "{" not in path and "*" not in path:
+                    # Both slash variants, so lookups need no normalization
+                    key = path.rstrip("/")
+                    routes = self._routes[method]
+                    routes[key or "/"] = routes[key + "/"] = func
             return func
 
         return decorator
@@ -209,14 +696,42 @@ class App:
 
     def static(self, url: str, path: str) -> None:
         """Set static route"""
-        self._static_dict[url] = path
-
-    def is_static(self, url: str) -> bool:
-        """Check if url can be resolved with static"""
-        return any((url.startswith(x) for x in self._static_dict))
-
-    def find_static(self, static: dict[str, str], path: str) -> str:
-        """returns final path"""
-        f = filter(path.startswith, static.keys())
-        s = sorted(f, key=lambda a: len(a.split("/")))
-        return path.replace(s[-1], static[s[-1]])
+        node = self._static_trie
+        for segment in url.split("/"):
+            if segment:
+                node = node.setdefault(segment, {})
+        node[_MOUNT] = os.path.abspath(path)
+        self._static_prefixes += (url.rstrip("/"),)
+
+    def _resolve_static(self, url: str) -> str | None:
+        """Get final path using the deepest matching static mount
+
+        Paths escaping the mount directory are not resolved"""
+        # Empty segments are skipped by the walk, but not by the prefix check
+        if not url.startswith(self._static_prefixes) and "//" not in url:
+            return None
+
+        segments = [segment for segment in url.split("/") if segment]
+        node = self._static_trie
+        mount = node.get(_MOUNT)
+        # Number of segments consumed by the mount
+        depth = 0
+
+        for i, segment in enumerate(segments):
+            child = node.get(segment)
+            if child is None:
+                break
+            node = child
+            if _MOUNT in node:
+                mount = node[_MOUNT]
+                depth = i + 1
+
+        if mount is None:
+            return None
+
+        abspath = os.path.normpath(os.path.join(mount, *segments[depth:]))
+
+        if os.path.commonpath([mount, abspath]) != mount:
+            return None
+
+        return abspath
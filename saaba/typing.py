@@ -1,8 +1,13 @@
-__all__ = ["RouteCallable", "RouteDecorator"]
+__all__ = ["RouteCallable", "RouteDecorator", "Scope", "Receive", "Send"]
 
-from typing import Any, Callable, TypeAlias
+from typing import Any, Awaitable, Callable, TypeAlias
 
 from .containers import Request, Response
 
 RouteCallable: TypeAlias = Callable[[Request, Response], Any]
 RouteDecorator: TypeAlias = Callable[[RouteCallable], RouteCallable]
+
+# ASGI
+Scope: TypeAlias = dict[str, Any]
+Receive: TypeAlias = Callable[[], Awaitable[dict[str, Any]]]
+Send: TypeAlias = Callable[[dict[str, Any]], Awaitable[None]]
@@ -1,6 +1,30 @@
 """Utilities"""
 
-__all__ = ["read_file", "get_path"]
+__all__ = ["read_file", "get_path", "json_dumps", "json_loads"]
+
+from typing import Any
+
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize object to JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def json_loads(data: bytes | bytearray | str) -> Any:
+        """Deserialize JSON"""
+        return orjson.loads(data)
+
+except ImportError:
+    import json
+
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize object to JSON bytes"""
+        return json.dumps(obj).encode("utf-8")
+
+    def json_loads(data: bytes | bytearray | str) -> Any:
+        """Deserialize JSON"""
+        return json.loads(data)
 
 
 def read_file(path: str) -> str:
@@ -0,0 +1,90 @@
+"""Route trie tests"""
+
+# pylint: disable=missing-function-docstring,protected-access
+
+import unittest
+
+from saaba import App
+from saaba.__pathargs import TrieNode
+
+
+def handler_named(name: str):
+    """Route handler that can be told apart from others"""
+
+    def handler(_req, res):
+        res.send(name)
+
+    handler.__name__ = name
+    return handler
+
+
+class TrieNodeTest(unittest.TestCase):
+    """Route precedence and params capture"""
+
+    def setUp(self) -> None:
+        self.trie = TrieNode()
+        self.me = handler_named("me")
+        self.user = handler_named("user")
+        self.post = handler_named("post")
+        self.files = handler_named("files")
+        self.trie.insert("/users/me", self.me)
+        self.trie.insert("/users/{id}", self.user)
+        self.trie.insert("/users/{id}/posts/{post}", self.post)
+        self.trie.insert("/files/*", self.files)
+
+    def test_plain_over_param(self) -> None:
+        self.assertEqual(self.trie.match("/users/me"), (self.me, {}))
+        self.assertEqual(self.trie.match("/users/42"), (self.user, {"id": "42"}))
+
+    def test_params(self) -> None:
+        self.assertEqual(
+            self.trie.match("/users/me/posts/7"),
+            (self.post, {"id": "me", "post": "7"}),
+        )
+
+    def test_wildcard(self) -> None:
+        self.assertEqual(
+            self.trie.match("/files/a/b.txt"), (self.files, {"*": "a/b.txt"})
+        )
+        self.assertEqual(self.trie.match("/files"), (self.files, {"*": ""}))
+
+    def test_param_over_wildcard_with_backtracking(self) -> None:
+        trie = TrieNode()
+        param = handler_named("param")
+        wildcard = handler_named("wildcard")
+        trie.insert("/a/{x}/c", param)
+        trie.insert("/a/*", wildcard)
+
+        self.assertEqual(trie.match("/a/b/c"), (param, {"x": "b"}))
+        # Param branch doesn't match the rest, so no param is left captured
+        self.assertEqual(trie.match("/a/b/d"), (wildcard, {"*": "b/d"}))
+
+    def test_empty_segments(self) -> None:
+        self.assertEqual(self.trie.match("/users/me/"), (self.me, {}))
+        self.assertEqual(self.trie.match("//users//42"), (self.user, {"id": "42"}))
+
+    def test_no_match(self) -> None:
+        self.assertEqual(self.trie.match("/users"), (None, {}))
+        self.assertEqual(self.trie.match("/nope/42"), (None, {}))
+
+    def test_conflicting_param_names(self) -> None:
+        with self.assertRaises(ValueError):
+            self.trie.insert("/users/{name}/about", handler_named("about"))
+
+
+class AppRoutesTest(unittest.TestCase):
+    """Routes registered through `App`"""
+
+    def test_trailing_slash(self) -> None:
+        app = App()
+        index = app.get("/")(handler_named("index"))
+        about = app.get("/about/")(handler_named("about"))
+
+        self.assertEqual(app._match("get", "/"), (index, {}))
+        self.assertEqual(app._match("get", "/about"), (about, {}))
+        self.assertEqual(app._match("get", "/about/"), (about, {}))
+        self.assertEqual(app._match("post", "/about"), (None, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
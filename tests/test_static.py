@@ -0,0 +1,113 @@
+"""Static mount tests"""
+
+# pylint: disable=missing-function-docstring,protected-access
+
+import asyncio
+import os
+import tempfile
+import unittest
+from typing import Any
+
+from saaba import App
+
+
+def asgi_get(app: App, path: str) -> tuple[int, bytes]:
+    """Make GET request through ASGI, `path` is percent-decoded"""
+    messages: list[dict[str, Any]] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope: dict[str, Any] = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "client": None,
+        "headers": [],
+    }
+    asyncio.run(app(scope, receive, send))
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return messages[0]["status"], body
+
+
+class StaticTest(unittest.TestCase):
+    """Static files resolution and path traversal"""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "public")
+        os.makedirs(os.path.join(self.root, "sub"))
+
+        for name, content in [
+            ("public/a.txt", "a"),
+            ("public/index.html", "index"),
+            ("public/sub/b.txt", "b"),
+            ("secret.txt", "secret"),
+        ]:
+            with open(os.path.join(self.tmp.name, name), "w", encoding="utf-8") as f:
+                f.write(content)
+
+        self.app = App()
+        self.app.static("/static", self.root)
+
+    def test_resolve(self) -> None:
+        resolve = self.app._resolve_static
+        self.assertEqual(resolve("/static/a.txt"), os.path.join(self.root, "a.txt"))
+        self.assertEqual(
+            resolve("/static/sub/b.txt"), os.path.join(self.root, "sub", "b.txt")
+        )
+        self.assertEqual(resolve("/static"), self.root)
+        self.assertIsNone(resolve("/other/a.txt"))
+        self.assertIsNone(resolve("/staticx/a.txt"))
+
+    def test_empty_segments(self) -> None:
+        resolve = self.app._resolve_static
+        expected = os.path.join(self.root, "a.txt")
+        self.assertEqual(resolve("//static/a.txt"), expected)
+        self.assertEqual(resolve("/static//a.txt"), expected)
+
+    def test_traversal(self) -> None:
+        resolve = self.app._resolve_static
+        self.assertIsNone(resolve("/static/../secret.txt"))
+        self.assertIsNone(resolve("/static/sub/../../secret.txt"))
+        self.assertIsNone(resolve("//static/..//secret.txt"))
+        self.assertEqual(
+            resolve("/static/sub/../a.txt"), os.path.join(self.root, "a.txt")
+        )
+
+    def test_encoded_traversal(self) -> None:
+        # Not decoded by `http.server`, so it's just a (missing) file name
+        resolved = self.app._resolve_static("/static/%2e%2e/secret.txt")
+        assert resolved is not None
+        self.assertTrue(resolved.startswith(os.path.join(self.root, "")))
+
+        # Decoded by ASGI servers
+        self.assertEqual(asgi_get(self.app, "/static/../secret.txt")[0], 404)
+
+    def test_asgi(self) -> None:
+        self.assertEqual(asgi_get(self.app, "/static/a.txt"), (200, b"a"))
+        self.assertEqual(asgi_get(self.app, "/static/"), (200, b"index"))
+        self.assertEqual(asgi_get(self.app, "/static/missing.txt")[0], 404)
+        self.assertEqual(asgi_get(self.app, "/static/a\x00b")[0], 404)
+
+    def test_relative_root(self) -> None:
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+
+        for path in [".", "./", ""]:
+            app = App()
+            app.static("/", path)
+            self.assertEqual(
+                app._resolve_static("/a.txt"), os.path.join(self.root, "a.txt")
+            )
+            self.assertIsNone(app._resolve_static("/../secret.txt"))
+
+
+if __name__ == "__main__":
+    unittest.main()